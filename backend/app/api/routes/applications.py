@@ -42,9 +42,14 @@ from app.services.nlp import (
     ExtractedEntities,
     compute_document_nlp_score,
     extract_entities,
+    extract_entities_batch,
     parse_date_flexible,
 )
-from app.services.ocr import extract_text
+from app.services.ocr import (
+    ExtractionResult,
+    extract_text,
+    ocr_lang_for_document_type,
+)
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
@@ -56,6 +61,7 @@ ALLOWED_CONTENT_TYPES = {
     "image/webp",
 }
 
+
 MANUAL_QUEUE_STATUSES = {
     ApplicationStatus.REVIEW_READY.value,
     ApplicationStatus.MORE_INFO_REQUIRED.value,
@@ -354,7 +360,9 @@ def read_application_documents(
     return ApplicationDocumentsPublic(data=documents, count=len(documents))
 
 
-def process_application_documents(application_id: uuid.UUID) -> None:
+def process_application_documents(
+    application_id: uuid.UUID, *, use_ocr_cache: bool = True
+) -> None:
     with Session(engine) as session:
         application = session.get(CitizenshipApplication, application_id)
         if not application:
@@ -382,6 +390,7 @@ def process_application_documents(application_id: uuid.UUID) -> None:
         processed_documents = 0
         failed_documents = 0
         all_entities: list[ExtractedEntities] = []
+        extracted: list[tuple[ApplicationDocument, ExtractionResult]] = []
 
         for document in documents:
             try:
@@ -395,11 +404,38 @@ def process_application_documents(application_id: uuid.UUID) -> None:
                 extraction = extract_text(
                     file_path=document.storage_path,
                     mime_type=document.mime_type or "application/pdf",
+                    use_cache=use_ocr_cache,
+                    lang=ocr_lang_for_document_type(document.document_type),
                 )
+                extracted.append((document, extraction))
+            except Exception as exc:
+                document.status = DocumentStatus.FAILED.value
+                document.processing_error = str(exc)
+                document.updated_at = get_datetime_utc()
+                session.add(document)
+                failed_documents += 1
 
-                # --- Real NLP entity extraction ---
-                entities = extract_entities(extraction.text)
-                all_entities.append(entities)
+        # --- Real NLP entity extraction (one batched spaCy pass per application) ---
+        # Stay in-process: spaCy workers must not be forked from the API server.
+        # Scan whole documents: expiry dates and residency history can sit on
+        # any page of a multi-page upload, past the default MAX_SCAN_CHARS cap.
+        texts = [extraction.text for _, extraction in extracted]
+        try:
+            batch_entities: list[ExtractedEntities] | None = extract_entities_batch(
+                texts, full_scan=True, n_process=1
+            )
+        except Exception:
+            # Fall back to per-document extraction so only the failing
+            # document is marked FAILED.
+            batch_entities = None
+
+        for index, (document, extraction) in enumerate(extracted):
+            try:
+                entities = (
+                    batch_entities[index]
+                    if batch_entities is not None
+                    else extract_entities(extraction.text, full_scan=True)
+                )
                 nlp_score = compute_document_nlp_score(entities)
 
                 document.ocr_text = extraction.text or (
@@ -419,6 +455,7 @@ def process_application_documents(application_id: uuid.UUID) -> None:
                 }
                 document.processing_error = None
                 document.status = DocumentStatus.PROCESSED.value
+                all_entities.append(entities)
                 processed_documents += 1
             except Exception as exc:
                 document.status = DocumentStatus.FAILED.value
@@ -900,7 +937,11 @@ def queue_application_processing(
     session.commit()
     session.refresh(application)
 
-    background_tasks.add_task(process_application_documents, application_id)
+    background_tasks.add_task(
+        process_application_documents,
+        application_id,
+        use_ocr_cache=not process_request.force_reprocess,
+    )
     return application
 
 
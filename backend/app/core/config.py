@@ -100,6 +100,30 @@ class Settings(BaseSettings):
 
     # Tesseract OCR binary path (set explicitly on Windows or non-PATH installs)
     TESSERACT_CMD: str | None = None
+    # Worker processes for page-parallel OCR of scanned PDFs (0 = one per CPU core)
+    OCR_WORKERS: int = 0
+    # OpenMP threads per Tesseract process (0 = 1 when OCR_WORKERS > 1, else unbounded)
+    TESSERACT_OMP_THREADS: int = 0
+    # Rendering resolution for scanned PDF pages, and the resolution used to
+    # re-OCR pages that came back with little text (0 disables the retry). Off by
+    # default: page "confidence" is a text-length heuristic, not Tesseract's word
+    # confidence, so the retry favours longer, possibly noisier output and OCRs
+    # every sparse page twice
+    OCR_RENDER_DPI: int = 200
+    OCR_RETRY_DPI: int = 0
+    # Extra Tesseract options: LSTM engine only, Leptonica adaptive Otsu thresholding
+    # (the only thresholding stage; pages are handed over in grayscale)
+    TESSERACT_CONFIG: str = "--oem 1 -c thresholding_method=1"
+    # Page segmentation mode: 6 = one uniform block (passports, certificates),
+    # 11 = sparse text (receipts, stamps)
+    TESSERACT_PSM: int = 6
+    # Directory for the content-addressed OCR result cache (unset = backend/data/ocr_cache)
+    OCR_CACHE_DIR: str | None = None
+    # Size bound for the on-disk OCR cache; least-recently-used entries go first
+    OCR_CACHE_SIZE_LIMIT_MB: int = 256
+    # Text-layer extraction backend for digital PDFs; pypdfium2 must be installed
+    # separately and falls back to PyMuPDF on any error
+    PDF_TEXT_BACKEND: Literal["pymupdf", "pypdfium2"] = "pymupdf"
 
     # Optional LLM-backed case explainer settings (OpenAI-compatible API)
     AI_EXPLAINER_BASE_URL: str | None = None
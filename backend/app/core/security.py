@@ -1,4 +1,7 @@
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
 from typing import Any
 
 import jwt
@@ -18,17 +21,58 @@ password_hash = PasswordHash(
 
 ALGORITHM = "HS256"
 
+# Verified access-token payloads. Clients send the same bearer token on every
+# request, so a hit skips signature verification and claim parsing; only the
+# cached "exp" is re-checked.
+_TOKEN_CACHE_MAX_ENTRIES = 1024
+_token_cache: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
-    expire = datetime.now(timezone.utc) + expires_delta
+    # PyJWT would floor an aware datetime to whole seconds; build the same
+    # NumericDate directly and skip the datetime round-trip.
+    expire = int(time.time() + expires_delta.total_seconds())
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict[str, Any]:
+    """Return the verified payload of ``token``, raising ``InvalidTokenError``.
+
+    Successful decodes are cached until the token expires; failures are never
+    cached, so a bad or expired token always goes through ``jwt.decode``. The
+    returned dict is shared and must not be modified.
+    """
+    key = (settings.SECRET_KEY, token)
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+        if payload is not None:
+            if payload["exp"] > time.time():
+                _token_cache.move_to_end(key)
+                return payload
+            del _token_cache[key]
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    # Without a numeric exp there is no safe point to drop the entry.
+    if isinstance(payload.get("exp"), int | float):
+        with _token_cache_lock:
+            _token_cache[key] = payload
+            _token_cache.move_to_end(key)
+            if len(_token_cache) > _TOKEN_CACHE_MAX_ENTRIES:
+                _token_cache.popitem(last=False)
+    return payload
+
+
 def verify_password(
     plain_password: str, hashed_password: str
 ) -> tuple[bool, str | None]:
+    # Stored passwords are at least 8 characters, so an empty one can never
+    # match; skip the KDF. Whether the submitted password was empty is already
+    # known to the caller, so returning early leaks nothing.
+    if not plain_password:
+        return False, None
     return password_hash.verify_and_update(plain_password, hashed_password)
 
 
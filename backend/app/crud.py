@@ -1,10 +1,19 @@
 import uuid
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlmodel import Session, col, delete, select
 
 from app.core.security import get_password_hash, verify_password
-from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
+from app.models import (
+    ApplicationDocument,
+    CitizenshipApplication,
+    Item,
+    ItemCreate,
+    User,
+    UserCreate,
+    UserUpdate,
+)
+from app.services import ocr_cache
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -31,6 +40,26 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     return db_user
 
 
+def delete_user(*, session: Session, db_user: User) -> None:
+    """Delete a user with their items, applications and documents.
+
+    Cached OCR text is applicant PII, so it is evicted for every document the
+    deletion removes. The rows go through ORM and database cascades, which do
+    not report each document, so the paths are collected up front.
+    """
+    statement = (
+        select(ApplicationDocument.storage_path)
+        .join(CitizenshipApplication)
+        .where(CitizenshipApplication.owner_id == db_user.id)
+    )
+    storage_paths = session.exec(statement).all()
+    session.exec(delete(Item).where(col(Item.owner_id) == db_user.id))
+    session.delete(db_user)
+    session.commit()
+    for storage_path in storage_paths:
+        ocr_cache.evict_source(storage_path)
+
+
 def get_user_by_email(*, session: Session, email: str) -> User | None:
     statement = select(User).where(User.email == email)
     session_user = session.exec(statement).first()
@@ -2,68 +2,129 @@
 
 Uses PyMuPDF for PDF text extraction and Pillow for image preprocessing.
 Falls back to pytesseract OCR when available for scanned/image-based documents.
+When ``tesserocr`` is installed, OCR runs in-process through libtesseract
+instead of starting a ``tesseract`` subprocess per image.
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import io
 import logging
+import math
+import multiprocessing
+import os
+import re
+import shlex
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from multiprocessing.pool import Pool
 from pathlib import Path
+from typing import Any
+
+from app.services import ocr_cache
 
 logger = logging.getLogger(__name__)
 
+# Tesseract language set used when the document type does not narrow it.
+DEFAULT_OCR_LANG = "eng+nor"
 
-def _configure_tesseract() -> None:
-    """Set pytesseract binary path from settings or auto-detect for the current platform."""
+
+@lru_cache(maxsize=1)
+def _detect_tesseract_path() -> str | None:
+    """Resolve the Tesseract binary once: settings, then PATH, then install locations."""
     import sys
 
     try:
-        import pytesseract
         from app.core.config import settings
 
-        # Use explicitly configured path only if it actually exists on the current OS.
-        if settings.TESSERACT_CMD and Path(settings.TESSERACT_CMD).is_file():
-            pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
-            logger.info("Tesseract binary configured from settings: %s", settings.TESSERACT_CMD)
-            return
+        configured = settings.TESSERACT_CMD
+    except Exception:
+        # Settings may not be available in test/import contexts — that's fine.
+        configured = None
+
+    # Use explicitly configured path only if it actually exists on the current OS.
+    if configured and Path(configured).is_file():
+        return configured
+
+    on_path = shutil.which("tesseract")
+    if on_path:
+        return on_path
+
+    # Common installation locations that are often missing from PATH.
+    if sys.platform == "win32":
+        _candidates = [
+            r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+            str(Path.home() / "AppData" / "Local" / "Programs" / "Tesseract-OCR" / "tesseract.exe"),
+        ]
+    elif sys.platform == "darwin":
+        _candidates = [
+            "/opt/homebrew/bin/tesseract",  # Apple Silicon (M1/M2/M3)
+            "/usr/local/bin/tesseract",     # Intel Mac (Homebrew)
+        ]
+    else:
+        # Linux (Ubuntu, Debian, etc.)
+        _candidates = [
+            "/usr/bin/tesseract",
+            "/usr/local/bin/tesseract",
+        ]
+
+    for candidate in _candidates:
+        if Path(candidate).is_file():
+            return candidate
+    return None
+
+
+def _configure_tesseract() -> None:
+    """Point pytesseract at the detected binary and export it for worker processes."""
+    path = _detect_tesseract_path()
+    if path is None:
+        logger.debug("Tesseract not found; OCR will report it as unavailable.")
+        return
+
+    # Spawned OCR workers re-import this module; TESSERACT_CMD feeds their
+    # settings so they take the configured-path branch without rescanning.
+    os.environ["TESSERACT_CMD"] = path
+    try:
+        import pytesseract
+    except Exception:
+        return
+    pytesseract.pytesseract.tesseract_cmd = path
+    logger.info("Tesseract binary: %s", path)
 
-        # Auto-detect common installation locations per platform.
-        if sys.platform == "win32":
-            _candidates = [
-                r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-                r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-                str(Path.home() / "AppData" / "Local" / "Programs" / "Tesseract-OCR" / "tesseract.exe"),
-            ]
-        elif sys.platform == "darwin":
-            _candidates = [
-                "/opt/homebrew/bin/tesseract",  # Apple Silicon (M1/M2/M3)
-                "/usr/local/bin/tesseract",     # Intel Mac (Homebrew)
-            ]
-        else:
-            # Linux (Ubuntu, Debian, etc.)
-            _candidates = [
-                "/usr/bin/tesseract",
-                "/usr/local/bin/tesseract",
-            ]
 
-        for candidate in _candidates:
-            if Path(candidate).is_file():
-                pytesseract.pytesseract.tesseract_cmd = candidate
-                logger.info("Tesseract auto-detected at: %s", candidate)
-                return
+def _limit_tesseract_threads() -> None:
+    """Cap Tesseract's OpenMP threads so parallel OCR workers don't oversubscribe cores.
 
-        # Fall back to pytesseract's default PATH lookup.
-        logger.debug("Tesseract not explicitly configured; relying on PATH lookup.")
+    Tesseract inherits ``OMP_THREAD_LIMIT`` from this process. An explicit
+    environment value always wins; otherwise ``TESSERACT_OMP_THREADS`` is used,
+    and when that is 0 the limit is 1 whenever OCR runs in several workers.
+    """
+    try:
+        from app.core.config import settings
+
+        threads = settings.TESSERACT_OMP_THREADS
+        workers = settings.OCR_WORKERS or os.cpu_count() or 1
     except Exception:
-        # Settings or pytesseract may not be available in test/import contexts — that's fine.
-        pass
+        return
+    if threads <= 0 and workers > 1:
+        threads = 1
+    if threads > 0:
+        os.environ.setdefault("OMP_THREAD_LIMIT", str(threads))
 
 
+_limit_tesseract_threads()
 _configure_tesseract()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExtractionResult:
     """Result of text extraction from a single document."""
 
@@ -79,8 +140,14 @@ class ExtractionResult:
         return len(self.text.strip()) == 0
 
 
-def extract_text_from_pdf(file_path: str | Path) -> ExtractionResult:
-    """Extract text from a PDF using PyMuPDF (fitz).
+# PDFs up to this many pages are probed for a text layer before extraction.
+_PDF_PROBE_PAGES = 2
+
+
+def extract_text_from_pdf(
+    file_path: str | Path, *, lang: str = DEFAULT_OCR_LANG
+) -> ExtractionResult:
+    """Extract text from a PDF using PyMuPDF (fitz), or pypdfium2 when configured.
 
     Works on digital (text-layer) PDFs. For scanned PDFs without a text layer,
     falls back to image-based OCR if Tesseract is available.
@@ -104,15 +171,40 @@ def extract_text_from_pdf(file_path: str | Path) -> ExtractionResult:
             warnings=[f"Failed to open PDF: {exc}"],
         )
 
-    pages_text: list[str] = []
-    for page in doc:
-        page_text = page.get_text("text")
-        if page_text.strip():
-            pages_text.append(page_text.strip())
+    # Plain-text defaults minus ligature preservation, so "ﬁ" comes out as "fi"
+    # and keyword matching sees ordinary spelling.
+    text_flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+
+    # A short PDF whose pages are all blank is a scan: go straight to OCR
+    # instead of trying another text backend. Longer documents always take the
+    # full text-layer pass, since blank leading pages say nothing about the rest.
+    probed: list[str] | None = None
+    if doc.page_count <= _PDF_PROBE_PAGES:
+        probed = [page.get_text("text", flags=text_flags) for page in doc.pages()]
+        if not any(page_text.strip() for page_text in probed):
+            doc.close()
+            return _ocr_pdf_pages(path, lang=lang)
+
+    method = "pymupdf_text_layer"
+    joined: tuple[str, int] | None = None
+    if _ocr_setting("PDF_TEXT_BACKEND", "pymupdf") == "pypdfium2":
+        try:
+            joined = _join_pages(_extract_with_pypdfium2(path))
+            method = "pdfium_text_layer"
+        except Exception as exc:
+            logger.debug("pypdfium2 text extraction failed, using PyMuPDF: %s", exc)
+
+    if joined is None:
+        # Stream one page at a time so only the current page object is alive.
+        joined = _join_pages(
+            probed
+            if probed is not None
+            else (page.get_text("text", flags=text_flags) for page in doc.pages())
+        )
 
     doc.close()
 
-    full_text = "\n\n".join(pages_text)
+    full_text, pages_with_text = joined
 
     if full_text.strip():
         char_count = len(full_text)
@@ -120,21 +212,62 @@ def extract_text_from_pdf(file_path: str | Path) -> ExtractionResult:
         confidence = min(1.0, char_count / 200)
         return ExtractionResult(
             text=full_text,
-            page_count=len(pages_text),
+            page_count=pages_with_text,
             char_count=char_count,
-            extraction_method="pymupdf_text_layer",
+            extraction_method=method,
             confidence=round(confidence, 2),
         )
 
     # PDF has no text layer — try OCR via Tesseract on rendered pages
-    return _ocr_pdf_pages(path)
+    return _ocr_pdf_pages(path, lang=lang)
 
 
-def extract_text_from_image(file_path: str | Path) -> ExtractionResult:
+def extract_text_from_image(
+    file_path: str | Path, *, lang: str = DEFAULT_OCR_LANG
+) -> ExtractionResult:
     """Extract text from an image file using Tesseract OCR via Pillow."""
-    path = Path(file_path)
+    image, error = _open_grayscale(Path(file_path))
+    if error is not None:
+        return error
+    return _ocr_image(image, lang=lang)
+
+
+def extract_text_from_images(
+    file_paths: Sequence[str | Path], *, lang: str = DEFAULT_OCR_LANG
+) -> list[ExtractionResult]:
+    """Extract text from several image files, loading Tesseract once for all of them.
+
+    Results are in input order. Files that cannot be opened get the same error
+    result as :func:`extract_text_from_image`; if the batch run fails, the
+    remaining images are OCRed one by one.
+    """
+    opened = [_open_grayscale(Path(file_path)) for file_path in file_paths]
+    images = [image for image, error in opened if error is None]
+
+    batch: list[ExtractionResult] | None = None
+    # In-process OCR already loads the models once, so only batch CLI runs.
+    if len(images) > 1 and _tesserocr_api(lang) is None:
+        with tempfile.TemporaryDirectory(prefix="ocr_images_") as tmp:
+            image_paths = []
+            for index, image in enumerate(images):
+                # PNM is uncompressed, so writing it costs no encode pass.
+                image_path = str(Path(tmp) / f"i{index:04}.pnm")
+                _preprocess_for_ocr(image).save(image_path, format="PPM")
+                image_paths.append(image_path)
+            batch = _ocr_image_batch(image_paths, lang=lang)
+    if batch is None:
+        batch = [_ocr_image(image, lang=lang) for image in images]
+
+    ocr_results = iter(batch)
+    return [
+        error if error is not None else next(ocr_results) for _image, error in opened
+    ]
+
+
+def _open_grayscale(path: Path) -> tuple[Any, ExtractionResult | None]:
+    """Open an image for OCR, or return the error result to report instead."""
     if not path.exists():
-        return ExtractionResult(
+        return None, ExtractionResult(
             text="",
             extraction_method="error",
             warnings=[f"File not found: {path}"],
@@ -143,30 +276,91 @@ def extract_text_from_image(file_path: str | Path) -> ExtractionResult:
     try:
         from PIL import Image
 
-        image = Image.open(path)
-        # Convert to RGB if needed (e.g. RGBA PNGs)
-        if image.mode not in ("L", "RGB"):
-            image = image.convert("RGB")
+        image: Image.Image = Image.open(path)
+        # OCR runs on grayscale; convert once here (also flattens RGBA/palette PNGs)
+        if image.mode != "L":
+            image = image.convert("L")
     except Exception as exc:
-        return ExtractionResult(
+        return None, ExtractionResult(
             text="",
             extraction_method="error",
             warnings=[f"Failed to open image: {exc}"],
         )
+    return image, None
+
 
-    return _ocr_image(image)
+# Tesseract language sets per document type. Each extra traineddata costs
+# model load time and an LSTM pass, so narrow the set where the script is known.
+# Applicants' passports are foreign, ICAO-standard and English-labelled;
+# language certificates and Norwegian tests are issued in Norwegian.
+_DOCUMENT_OCR_LANGS = {
+    "passport": "eng",
+    "language_certificate": "nor",
+    "norwegian_test": "nor",
+}
 
+_IMAGE_MIME_TYPES = frozenset({"image/jpeg", "image/png", "image/webp"})
+
+# Outcomes that depend on the environment rather than the file, so never cached.
+_UNCACHEABLE_METHODS = frozenset({"error", "ocr_unavailable"})
+
+
+def ocr_lang_for_document_type(document_type: str | None) -> str:
+    """Pick the Tesseract language set for a document type (see ``_DOCUMENT_OCR_LANGS``)."""
+    if not document_type:
+        return DEFAULT_OCR_LANG
+    return _DOCUMENT_OCR_LANGS.get(document_type.strip().lower(), DEFAULT_OCR_LANG)
+
+
+def extract_text(
+    file_path: str | Path,
+    mime_type: str,
+    *,
+    use_cache: bool = True,
+    lang: str = DEFAULT_OCR_LANG,
+) -> ExtractionResult:
+    """Route extraction to the appropriate handler based on MIME type.
+
+    ``lang`` is the Tesseract language set used if the document needs OCR.
+    Results are cached by file content (see ``ocr_cache``). ``use_cache=False``
+    skips the lookup and forces a fresh extraction, whose result still
+    refreshes the cache entry.
+    """
+    if mime_type != "application/pdf" and mime_type not in _IMAGE_MIME_TYPES:
+        return ExtractionResult(
+            text="",
+            extraction_method="unsupported",
+            warnings=[f"Unsupported MIME type: {mime_type}"],
+        )
+
+    try:
+        key: str | None = ocr_cache.cache_key(file_path, mime_type, lang)
+    except OSError:
+        # Unreadable or missing file: let the handler report it.
+        key = None
+
+    if use_cache and key is not None:
+        cached = ocr_cache.get(key)
+        if cached is not None:
+            return cached
 
-def extract_text(file_path: str | Path, mime_type: str) -> ExtractionResult:
-    """Route extraction to the appropriate handler based on MIME type."""
     if mime_type == "application/pdf":
-        return extract_text_from_pdf(file_path)
-    if mime_type in {"image/jpeg", "image/png", "image/webp"}:
-        return extract_text_from_image(file_path)
-    return ExtractionResult(
-        text="",
-        extraction_method="unsupported",
-        warnings=[f"Unsupported MIME type: {mime_type}"],
+        result = extract_text_from_pdf(file_path, lang=lang)
+    else:
+        result = extract_text_from_image(file_path, lang=lang)
+
+    if key is not None and result.extraction_method not in _UNCACHEABLE_METHODS:
+        ocr_cache.put(key, result, source=file_path)
+    return result
+
+
+async def extract_text_async(
+    file_path: str | Path, mime_type: str, *, lang: str = DEFAULT_OCR_LANG
+) -> ExtractionResult:
+    """Run :func:`extract_text` in the OCR process pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), partial(extract_text, file_path, mime_type, lang=lang)
     )
 
 
@@ -175,28 +369,93 @@ def extract_text(file_path: str | Path, mime_type: str) -> ExtractionResult:
 # ---------------------------------------------------------------------------
 
 
-def _ocr_image(image: object) -> ExtractionResult:
+def _preprocess_for_ocr(image: Any) -> Any:
+    """Convert a PIL image to 8-bit grayscale for Tesseract.
+
+    Thresholding is left to Tesseract (``thresholding_method=1`` in
+    ``TESSERACT_CONFIG``): its adaptive Otsu works per tile, so unevenly lit
+    photos keep text that a single page-wide threshold would wipe out.
+    """
+    return image if image.mode == "L" else image.convert("L")
+
+
+def _tesseract_config(psm: int | None = None) -> str:
+    """Tesseract CLI options: ``TESSERACT_CONFIG`` plus the page segmentation mode."""
+    options = _ocr_setting("TESSERACT_CONFIG", "--oem 1 -c thresholding_method=1")
+    if psm is None:
+        psm = _ocr_setting("TESSERACT_PSM", 6)
+    return f"{options} --psm {psm}"
+
+
+def _tesserocr_options(config: str) -> tuple[int, int, dict[str, str]] | None:
+    """Translate Tesseract CLI options into ``(oem, psm, variables)`` for tesserocr.
+
+    Returns ``None`` for options tesserocr cannot take, so the caller keeps the
+    CLI path and its exact behaviour.
+    """
+    oem, psm, variables = 3, 3, {}  # Tesseract's own defaults
+    tokens = iter(shlex.split(config))
+    try:
+        for token in tokens:
+            if token == "--oem":
+                oem = int(next(tokens))
+            elif token == "--psm":
+                psm = int(next(tokens))
+            elif token == "-c":
+                name, _, value = next(tokens).partition("=")
+                variables[name] = value
+            else:
+                return None
+    except (StopIteration, ValueError):
+        return None
+    return oem, psm, variables
+
+
+# libtesseract handles are not thread-safe: one per thread, language and config.
+_tesserocr_local = threading.local()
+
+
+def _tesserocr_api(lang: str) -> Any | None:
+    """Return this thread's in-process Tesseract handle, or None to use the CLI."""
+    config = _tesseract_config()
+    apis = getattr(_tesserocr_local, "apis", None)
+    if apis is None:
+        apis = _tesserocr_local.apis = {}
+    key = (lang, config)
+    if key not in apis:
+        apis[key] = None
+        options = _tesserocr_options(config)
+        if options is not None:
+            try:
+                import tesserocr
+
+                oem, psm, variables = options
+                api = tesserocr.PyTessBaseAPI(lang=lang, oem=oem, psm=psm)
+                for name, value in variables.items():
+                    api.SetVariable(name, value)
+                apis[key] = api
+            except Exception as exc:
+                logger.debug("tesserocr unavailable, using the tesseract CLI: %s", exc)
+    return apis[key]
+
+
+def _ocr_image(image: Any, *, lang: str = DEFAULT_OCR_LANG) -> ExtractionResult:
     """Run Tesseract OCR on a PIL Image. Gracefully degrades if unavailable."""
+    api = _tesserocr_api(lang)
+    if api is not None:
+        try:
+            api.SetImage(_preprocess_for_ocr(image))
+            return _page_result(api.GetUTF8Text())
+        except Exception as exc:
+            logger.debug("tesserocr failed, retrying with the tesseract CLI: %s", exc)
+
     try:
         import pytesseract
 
-        text = pytesseract.image_to_string(image, lang="eng+nor")
-        text = text.strip()
-        if text:
-            confidence = min(1.0, len(text) / 150)
-            return ExtractionResult(
-                text=text,
-                page_count=1,
-                char_count=len(text),
-                extraction_method="tesseract_ocr",
-                confidence=round(confidence, 2),
-            )
-        return ExtractionResult(
-            text="",
-            extraction_method="tesseract_ocr",
-            confidence=0.0,
-            warnings=["Tesseract returned empty text"],
+        text = pytesseract.image_to_string(
+            _preprocess_for_ocr(image), lang=lang, config=_tesseract_config()
         )
+        return _page_result(text)
     except Exception as exc:
         logger.warning("Tesseract OCR unavailable: %s", exc)
         return ExtractionResult(
@@ -210,13 +469,272 @@ def _ocr_image(image: object) -> ExtractionResult:
         )
 
 
-def _ocr_pdf_pages(pdf_path: Path) -> ExtractionResult:
-    """Render PDF pages to images and OCR each one."""
+def _join_pages(pages: Iterable[str]) -> tuple[str, int]:
+    """Join non-blank page texts with blank lines; returns the text and page count."""
+    buf = io.StringIO()
+    count = 0
+    for page_text in pages:
+        page_text = page_text.strip()
+        if not page_text:
+            continue
+        if count:
+            buf.write("\n\n")
+        buf.write(page_text)
+        count += 1
+    return buf.getvalue(), count
+
+
+def _extract_with_pypdfium2(path: Path) -> list[str]:
+    """Read the text layer of every page with PDFium; returns non-empty pages."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(str(path))
+    try:
+        pages_text: list[str] = []
+        for page in pdf:
+            # PDFium separates lines with CRLF; normalise to match PyMuPDF output.
+            page_text = page.get_textpage().get_text_bounded().replace("\r\n", "\n").strip()
+            if page_text:
+                pages_text.append(page_text)
+        return pages_text
+    finally:
+        pdf.close()
+
+
+# Cheap fix-ups for common Tesseract misreads inside numbers. Deliberately
+# narrow: letter-O after a letter is left alone ("NO1234567" is a real
+# passport prefix) and whitespace between digit groups is kept (it separates
+# street numbers from postcodes in addresses).
+_POST_FIXES = (
+    (re.compile(r"[\x01-\x08\x0b\x0c\x0e-\x1f]"), ""),  # stray control chars
+    (re.compile(r"(?<=\d)[Oo](?=\d)"), "0"),  # 19O5 -> 1905
+    (re.compile(r"(?<=\d)[Oo](?=[./\-][\dOo])|(?<=[\dOo][./\-])[Oo](?=\d)"), "0"),  # 1O.O3 -> 10.03
+    (re.compile(r"(?<=\d{3})[Oo]\b"), "0"),  # 199O -> 1990
+    (re.compile(r"(?<=\d)[Il|](?=\d)"), "1"),  # 20l5 -> 2015
+)
+
+
+def _postprocess_ocr_text(text: str) -> str:
+    for pattern, replacement in _POST_FIXES:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _page_result(text: str) -> ExtractionResult:
+    """Build the single-page result for raw Tesseract output."""
+    text = _postprocess_ocr_text(text).strip()
+    if text:
+        confidence = min(1.0, len(text) / 150)
+        return ExtractionResult(
+            text=text,
+            page_count=1,
+            char_count=len(text),
+            extraction_method="tesseract_ocr",
+            confidence=round(confidence, 2),
+        )
+    return ExtractionResult(
+        text="",
+        extraction_method="tesseract_ocr",
+        confidence=0.0,
+        warnings=["Tesseract returned empty text"],
+    )
+
+
+def _ocr_image_batch(
+    image_paths: list[str], *, lang: str = DEFAULT_OCR_LANG
+) -> list[ExtractionResult] | None:
+    """OCR several image files in one Tesseract run via a file-list manifest.
+
+    Tesseract loads its language models once per process, so a single run over
+    all pages avoids paying that startup cost per page. Returns ``None`` when
+    the batch run fails or its output cannot be split back into pages, so the
+    caller can fall back to per-page OCR.
+    """
+    if not image_paths:
+        return []
+    try:
+        import pytesseract
+
+        manifest = Path(image_paths[0]).with_name("images.txt")
+        manifest.write_text("\n".join(image_paths) + "\n", encoding="utf-8")
+        output = pytesseract.image_to_string(
+            str(manifest), lang=lang, config=_tesseract_config()
+        )
+    except Exception as exc:
+        logger.debug("Batch OCR failed, falling back to per-page OCR: %s", exc)
+        return None
+
+    # Tesseract terminates every page with a form feed.
+    pages = output.split("\x0c")
+    if len(pages) == len(image_paths) + 1 and not pages[-1].strip():
+        pages.pop()
+    if len(pages) != len(image_paths):
+        logger.debug(
+            "Batch OCR returned %d pages for %d images; falling back to per-page OCR",
+            len(pages),
+            len(image_paths),
+        )
+        return None
+    return [_page_result(text) for text in pages]
+
+
+def _ocr_setting(name: str, default: Any) -> Any:
+    """Read an OCR tuning value from settings, tolerating import-less contexts."""
+    try:
+        from app.core.config import settings
+
+        return getattr(settings, name)
+    except Exception:
+        return default
+
+
+def _ocr_worker_count() -> int:
+    """Number of OCR worker processes from settings (0 means one per CPU core)."""
+    configured = _ocr_setting("OCR_WORKERS", 0)
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+_POOL: Pool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> Pool:
+    """Create the page-OCR process pool on first use and reuse it afterwards."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawn, not fork: the API process is multi-threaded.
+            _POOL = multiprocessing.get_context("spawn").Pool(_ocr_worker_count())
+            atexit.register(_POOL.terminate)
+        return _POOL
+
+
+def _discard_pool(pool: Pool) -> None:
+    """Terminate ``pool`` so the next call starts from fresh workers.
+
+    A no-op when another thread has already replaced it, so a late failure
+    cannot tear down a pool that other requests are using.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not pool:
+            return
+        _POOL = None
+    pool.terminate()
+
+
+# Pages whose first-pass (text-length) confidence falls below this are
+# re-rendered at OCR_RETRY_DPI when the retry is enabled.
+_RETRY_CONFIDENCE = 0.5
+
+
+_EXECUTOR: ProcessPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+# Set in extract_text_async workers: they OCR pages in-process rather than
+# starting a nested page pool of their own.
+_IN_EXECUTOR_WORKER = False
+
+
+def _init_executor_worker() -> None:
+    global _IN_EXECUTOR_WORKER
+    _IN_EXECUTOR_WORKER = True
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Create the document-level OCR executor on first use and reuse it afterwards."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(
+                max_workers=_ocr_worker_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_executor_worker,
+            )
+            atexit.register(_EXECUTOR.shutdown, wait=False, cancel_futures=True)
+        return _EXECUTOR
+
+
+def _ocr_page_list(
+    task: tuple[str, tuple[int, ...], int, str],
+) -> list[tuple[int, ExtractionResult]]:
+    """Render and OCR the given PDF pages at ``dpi`` in ``lang``; runs inside pool workers."""
     import fitz  # PyMuPDF
     from PIL import Image
 
+    pdf_path, page_numbers, dpi, lang = task
+    zoom = dpi / 72.0
+    mat = fitz.Matrix(zoom, zoom)
+    with fitz.open(pdf_path) as doc:
+        if len(page_numbers) > 1 and _tesserocr_api(lang) is None:
+            with tempfile.TemporaryDirectory(prefix="ocr_pages_") as tmp:
+                image_paths = []
+                for page_num in page_numbers:
+                    pix = doc[page_num].get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csGRAY)
+                    img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+                    # PNM is uncompressed, so writing it costs no encode pass.
+                    image_path = str(Path(tmp) / f"p{page_num:04}.pnm")
+                    _preprocess_for_ocr(img).save(image_path, format="PPM")
+                    image_paths.append(image_path)
+                batch = _ocr_image_batch(image_paths, lang=lang)
+            if batch is not None:
+                return list(zip(page_numbers, batch, strict=True))
+
+        results: list[tuple[int, ExtractionResult]] = []
+        for page_num in page_numbers:
+            # Render straight to 8-bit gray, the mode _preprocess_for_ocr works in,
+            # and wrap the raw samples without an encode/decode or mode convert.
+            pix = doc[page_num].get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csGRAY)
+            img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+            result = _ocr_image(img, lang=lang)
+            results.append((page_num, result))
+            # If Tesseract is unavailable, stop trying more pages
+            if result.extraction_method == "ocr_unavailable":
+                break
+    return results
+
+
+def _ocr_pages_sharded(
+    pdf_path: Path, page_numbers: list[int], dpi: int, lang: str = DEFAULT_OCR_LANG
+) -> list[tuple[int, ExtractionResult]]:
+    """OCR ``page_numbers`` in contiguous shards across the pool, ordered by page."""
+    workers = 1 if _IN_EXECUTOR_WORKER else min(_ocr_worker_count(), len(page_numbers))
+    if workers > 1:
+        seg_size = math.ceil(len(page_numbers) / workers)
+        tasks = [
+            (str(pdf_path), tuple(page_numbers[i : i + seg_size]), dpi, lang)
+            for i in range(0, len(page_numbers), seg_size)
+        ]
+        pool = _get_pool()
+        try:
+            page_results = [
+                item
+                for chunk in pool.imap_unordered(_ocr_page_list, tasks)
+                for item in chunk
+            ]
+            page_results.sort(key=lambda item: item[0])
+            return page_results
+        except Exception as exc:
+            logger.warning("Parallel OCR failed, retrying in-process: %s", exc)
+            _discard_pool(pool)
+    return _ocr_page_list((str(pdf_path), tuple(page_numbers), dpi, lang))
+
+
+def _ocr_pdf_pages(
+    pdf_path: Path, dpi: int | None = None, *, lang: str = DEFAULT_OCR_LANG
+) -> ExtractionResult:
+    """Render PDF pages to images and OCR them, sharding pages across processes.
+
+    Pages are rendered at ``dpi`` (default ``OCR_RENDER_DPI``). If
+    ``OCR_RETRY_DPI`` is set, pages that come back with little text are
+    re-rendered once at that resolution and the longer result is kept.
+    """
+    import fitz  # PyMuPDF
+
     try:
-        doc = fitz.open(str(pdf_path))
+        with fitz.open(str(pdf_path)) as doc:
+            page_count = doc.page_count
     except Exception as exc:
         return ExtractionResult(
             text="",
@@ -224,26 +742,37 @@ def _ocr_pdf_pages(pdf_path: Path) -> ExtractionResult:
             warnings=[f"Failed to open PDF for OCR: {exc}"],
         )
 
+    dpi = dpi or _ocr_setting("OCR_RENDER_DPI", 200)
+    page_results = _ocr_pages_sharded(pdf_path, list(range(page_count)), dpi, lang)
+
+    retry_dpi = _ocr_setting("OCR_RETRY_DPI", 0)
+    low_confidence = [
+        page_num
+        for page_num, result in page_results
+        if result.extraction_method == "tesseract_ocr"
+        and result.confidence < _RETRY_CONFIDENCE
+    ]
+    if retry_dpi > dpi and low_confidence:
+        by_page = dict(page_results)
+        for page_num, retried in _ocr_pages_sharded(
+            pdf_path, low_confidence, retry_dpi, lang
+        ):
+            if retried.confidence > by_page[page_num].confidence:
+                by_page[page_num] = retried
+        page_results = sorted(by_page.items())
+
     all_text: list[str] = []
     warnings: list[str] = []
 
-    for _page_num, page in enumerate(doc):
-        # Render page at 300 DPI for OCR quality
-        mat = fitz.Matrix(300 / 72, 300 / 72)
-        pix = page.get_pixmap(matrix=mat)
-        img = Image.open(io.BytesIO(pix.tobytes("png")))
-
-        result = _ocr_image(img)
+    for _page_num, result in page_results:
         if result.text.strip():
             all_text.append(result.text.strip())
         if result.warnings:
             warnings.extend(result.warnings)
-        # If Tesseract is unavailable, stop trying more pages
+        # If Tesseract is unavailable, ignore results from later pages
         if result.extraction_method == "ocr_unavailable":
             break
 
-    doc.close()
-
     full_text = "\n\n".join(all_text)
     method = "tesseract_ocr_pdf" if full_text else "ocr_unavailable"
     confidence = min(1.0, len(full_text) / 200) if full_text else 0.0
@@ -0,0 +1,173 @@
+"""Content-addressed cache for OCR extraction results.
+
+Entries are keyed on a SHA-256 digest of the file bytes plus the MIME type and
+the OCR settings that influence the output. Two tiers: a bounded in-process
+LRU in front of a size-limited ``diskcache`` store, so re-processing an
+unchanged document is a dict lookup, or at worst a small SQLite read, instead
+of a full OCR run.
+
+Cached text is applicant PII. Each entry is tagged with the path of the file it
+was extracted from, and :func:`evict_source` drops those entries when the
+document is deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import diskcache
+
+if TYPE_CHECKING:
+    from app.services.ocr import ExtractionResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction logic changes in a way that invalidates stored results.
+CACHE_VERSION = "v1"
+
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "ocr_cache"
+_DEFAULT_SIZE_LIMIT_MB = 256
+
+# In-process tier: key -> (source tag, result).
+_MEMORY_MAX_ENTRIES = 512
+_memory: OrderedDict[str, tuple[str | None, ExtractionResult]] = OrderedDict()
+_memory_lock = threading.Lock()
+
+# Disk tier, reopened when OCR_CACHE_DIR changes.
+_disk: diskcache.Cache | None = None
+_disk_lock = threading.Lock()
+
+
+def _cache_dir() -> Path:
+    try:
+        from app.core.config import settings
+
+        configured = settings.OCR_CACHE_DIR
+    except Exception:
+        configured = None
+    return Path(configured) if configured else _DEFAULT_CACHE_DIR
+
+
+def _size_limit_bytes() -> int:
+    try:
+        from app.core.config import settings
+
+        size_limit_mb = settings.OCR_CACHE_SIZE_LIMIT_MB
+    except Exception:
+        size_limit_mb = _DEFAULT_SIZE_LIMIT_MB
+    return size_limit_mb * 1024 * 1024
+
+
+def _disk_cache() -> diskcache.Cache:
+    """Return the disk tier for the configured directory, opening it on first use."""
+    global _disk
+    directory = str(_cache_dir())
+    with _disk_lock:
+        if _disk is None or _disk.directory != directory:
+            if _disk is not None:
+                _disk.close()
+            _disk = diskcache.Cache(
+                directory,
+                size_limit=_size_limit_bytes(),
+                eviction_policy="least-recently-used",
+                tag_index=True,
+            )
+        return _disk
+
+
+def _config_fingerprint() -> str:
+    """Describe the OCR settings that change extraction output."""
+    try:
+        from app.core.config import settings
+
+        return (
+            f"{settings.OCR_RENDER_DPI}-{settings.OCR_RETRY_DPI}-"
+            f"{settings.TESSERACT_CONFIG}-{settings.TESSERACT_PSM}-"
+            f"{settings.PDF_TEXT_BACKEND}"
+        )
+    except Exception:
+        return "default"
+
+
+def cache_key(file_path: str | Path, mime_type: str, lang: str) -> str:
+    """Build the cache key for a file's current contents OCRed in ``lang``."""
+    with open(file_path, "rb") as fh:
+        # SHA-256 runs on the CPU's SHA extensions where present, which makes it
+        # faster than BLAKE2b for whole-file hashing on current x86 hosts.
+        digest = hashlib.file_digest(fh, "sha256")
+    return (
+        f"{digest.hexdigest()}:{mime_type}:{lang}:"
+        f"{CACHE_VERSION}-{_config_fingerprint()}"
+    )
+
+
+def _source_tag(source: str | Path | None) -> str | None:
+    return str(Path(source).resolve()) if source is not None else None
+
+
+def get(key: str) -> ExtractionResult | None:
+    """Return the cached result for ``key``, or ``None`` on a miss.
+
+    Each hit is a copy with its own ``warnings`` list, so a caller appending to
+    it does not change what later hits see.
+    """
+    from app.services.ocr import ExtractionResult
+
+    with _memory_lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            result = _memory[key][1]
+            return replace(result, warnings=list(result.warnings))
+
+    try:
+        data, tag = _disk_cache().get(key, tag=True)
+        if data is None:
+            return None
+        result = ExtractionResult(**data)
+        _remember(key, result, tag)
+        return replace(result, warnings=list(result.warnings))
+    except Exception as exc:
+        logger.warning("Ignoring unreadable OCR cache entry %s: %s", key, exc)
+        return None
+
+
+def put(
+    key: str, result: ExtractionResult, *, source: str | Path | None = None
+) -> None:
+    """Store ``result`` under ``key``. Failures are logged, never raised.
+
+    ``source`` is the file the result was extracted from; pass it so the entry
+    can be dropped with :func:`evict_source` when that file's document goes.
+    """
+    tag = _source_tag(source)
+    _remember(key, result, tag)
+    try:
+        _disk_cache().set(key, asdict(result), tag=tag)
+    except Exception as exc:
+        logger.warning("Could not write OCR cache entry %s: %s", key, exc)
+
+
+def evict_source(source: str | Path) -> None:
+    """Drop every cached result extracted from ``source``."""
+    tag = _source_tag(source)
+    with _memory_lock:
+        for key in [key for key, (entry_tag, _) in _memory.items() if entry_tag == tag]:
+            del _memory[key]
+    try:
+        _disk_cache().evict(tag)
+    except Exception as exc:
+        logger.warning("Could not evict OCR cache entries for %s: %s", source, exc)
+
+
+def _remember(key: str, result: ExtractionResult, tag: str | None) -> None:
+    with _memory_lock:
+        _memory[key] = (tag, result)
+        _memory.move_to_end(key)
+        if len(_memory) > _MEMORY_MAX_ENTRIES:
+            _memory.popitem(last=False)
@@ -3,4 +3,5 @@
 set -e
 set -x
 
-pytest tests/
+# One worker per CPU; loadscope keeps each module on a single worker.
+pytest -n auto --dist loadscope tests/
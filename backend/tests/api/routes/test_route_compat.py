@@ -1,36 +1,45 @@
+from typing import Any
+
+import pytest
 from fastapi.testclient import TestClient
 
 from app.core.config import settings
 
-
-def test_root_endpoint_exists(client: TestClient) -> None:
-    r = client.get("/")
+API = settings.API_V1_STR
+
+
+@pytest.mark.parametrize(
+    ("path", "expected_payload"),
+    [
+        (
+            "/",
+            {
+                "message": "Norwegian Citizenship Automation API",
+                "docs": "/docs",
+                "redoc": "/redoc",
+                "openapi": f"{API}/openapi.json",
+            },
+        ),
+        ("/healthz", {"status": "ok"}),
+    ],
+)
+def test_endpoint_exists(
+    client: TestClient, path: str, expected_payload: dict[str, Any]
+) -> None:
+    r = client.get(path)
     assert r.status_code == 200
-    payload = r.json()
-    assert payload["docs"] == "/docs"
-    assert payload["redoc"] == "/redoc"
-    assert payload["openapi"] == f"{settings.API_V1_STR}/openapi.json"
-
-
-def test_healthz_endpoint_exists(client: TestClient) -> None:
-    r = client.get("/healthz")
-    assert r.status_code == 200
-    assert r.json() == {"status": "ok"}
-
-
-def test_openapi_root_compat_redirect(client: TestClient) -> None:
-    r = client.get("/openapi.json", follow_redirects=False)
-    assert r.status_code in {307, 308}
-    assert r.headers["location"] == f"{settings.API_V1_STR}/openapi.json"
-
-
-def test_api_v1_docs_compat_redirect(client: TestClient) -> None:
-    r = client.get(f"{settings.API_V1_STR}/docs", follow_redirects=False)
-    assert r.status_code in {307, 308}
-    assert r.headers["location"] == "/docs"
-
-
-def test_api_v1_redoc_compat_redirect(client: TestClient) -> None:
-    r = client.get(f"{settings.API_V1_STR}/redoc", follow_redirects=False)
+    assert r.json() == expected_payload
+
+
+@pytest.mark.parametrize(
+    ("path", "expected_location"),
+    [
+        ("/openapi.json", f"{API}/openapi.json"),
+        (f"{API}/docs", "/docs"),
+        (f"{API}/redoc", "/redoc"),
+    ],
+)
+def test_compat_redirect(client: TestClient, path: str, expected_location: str) -> None:
+    r = client.get(path, follow_redirects=False)
     assert r.status_code in {307, 308}
-    assert r.headers["location"] == "/redoc"
+    assert r.headers["location"] == expected_location
@@ -1,7 +1,16 @@
 from fastapi.testclient import TestClient
+from sqlmodel import Session
 
+from app.api.routes.utils import health_check
+from app.core.config import settings
 
-def test_health_check_reports_database_status(client: TestClient) -> None:
-    response = client.get("/api/v1/utils/health-check/")
+
+def test_health_check_reports_database_status(db: Session) -> None:
+    # Called directly: the assertion is about the DB probe, not the HTTP stack.
+    assert health_check(session=db) == {"status": "ok", "database": "ok"}
+
+
+def test_health_check_endpoint(client: TestClient) -> None:
+    response = client.get(f"{settings.API_V1_STR}/utils/health-check/")
     assert response.status_code == 200
     assert response.json() == {"status": "ok", "database": "ok"}
@@ -1,24 +1,154 @@
+import hashlib
+import os
 from collections.abc import Generator
+from pathlib import Path
+from typing import Any
 
 import pytest
 from alembic import command
 from alembic.config import Config
 from fastapi.testclient import TestClient
-from sqlmodel import Session, delete
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+from sqlmodel import Session, create_engine, delete, text
 
 from app.core.config import settings
-from app.core.db import engine, init_db
-from app.main import app
-from app.models import Item, User
-from tests.utils.user import authentication_token_from_email
-from tests.utils.utils import get_superuser_token_headers
+
+# Under pytest-xdist every worker gets its own database, so the session-scoped
+# fixtures and the cleanup in `db` never race across workers. This has to run
+# before app.core.db builds its engine from settings.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+_BASE_DATABASE_URI = str(settings.SQLALCHEMY_DATABASE_URI)
+if _XDIST_WORKER:
+    settings.POSTGRES_DB = f"{settings.POSTGRES_DB}_test_{_XDIST_WORKER}"
+
+from app import crud  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.db import engine, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    ApplicationDocument,
+    ApplicationStatus,
+    CitizenshipApplication,
+    DocumentStatus,
+    Item,
+    User,
+)
+from app.services import ocr_cache  # noqa: E402
+from tests.utils.user import authentication_token_from_email  # noqa: E402
+from tests.utils.utils import get_superuser_token_headers  # noqa: E402
+
+# Tests create and log in users constantly; the production Argon2 parameters
+# cost ~0.4 s per hash + verify. Minimum-cost hashers keep the same code paths
+# (including rehash-on-login) at a fraction of a millisecond.
+security.password_hash = PasswordHash(
+    (
+        Argon2Hasher(time_cost=1, memory_cost=8, parallelism=1),
+        BcryptHasher(rounds=4),
+    )
+)
+
+_APPLICATION_PAYLOAD = {
+    "applicant_full_name": "Test Applicant",
+    "applicant_nationality": "Filipino",
+}
+_PASSPORT_BYTES = b"%PDF-1.4 fake passport bytes"
+_PASSPORT_FILES = {"file": ("passport.pdf", _PASSPORT_BYTES, "application/pdf")}
+_PASSPORT_DATA = {"document_type": "passport"}
+
+
+# Arbitrary key for the advisory lock that serializes worker database creation.
+_CREATE_DATABASE_LOCK_KEY = 0x7E57DB
+
+
+def _ensure_worker_database() -> None:
+    admin_engine = create_engine(_BASE_DATABASE_URI, isolation_level="AUTOCOMMIT")
+    with admin_engine.connect() as connection:
+        # Concurrent CREATE DATABASE calls copy template1 at the same time and
+        # fail with "source database is being accessed by other users".
+        lock_args = {"key": _CREATE_DATABASE_LOCK_KEY}
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), lock_args)
+        try:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": settings.POSTGRES_DB},
+            ).scalar()
+            if not exists:
+                connection.execute(text(f'CREATE DATABASE "{settings.POSTGRES_DB}"'))
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), lock_args)
+    admin_engine.dispose()
+
+
+_MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / "app" / "alembic" / "versions"
+
+
+def _migrations_digest() -> str:
+    digest = hashlib.sha256()
+    for path in sorted(_MIGRATIONS_DIR.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _upgrade_schema() -> None:
+    """Run Alembic to head unless the schema was built from these migrations.
+
+    The stamp is a comment on ``alembic_version`` combining the digest of the
+    migration files with the revision they produced, so edited migrations, a
+    downgrade or a recreated database all trigger a real upgrade.
+    """
+    digest = _migrations_digest()
+    with engine.connect() as connection:
+        stamp = connection.execute(
+            text("SELECT obj_description(to_regclass('alembic_version'), 'pg_class')")
+        ).scalar()
+        if stamp is not None:
+            revision = connection.execute(
+                text("SELECT version_num FROM alembic_version")
+            ).scalar()
+            if stamp == f"{digest}:{revision}":
+                return
+
+    command.upgrade(Config("alembic.ini"), "head")
+
+    with engine.begin() as connection:
+        revision = connection.execute(
+            text("SELECT version_num FROM alembic_version")
+        ).scalar()
+        # COMMENT ON does not accept bind parameters; both parts are hex/ids.
+        connection.execute(
+            text(f"COMMENT ON TABLE alembic_version IS '{digest}:{revision}'")
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def ocr_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Generator[Path, None, None]:
+    """Point the OCR cache at a temporary directory for the whole run.
+
+    Cached entries are extracted document text, so they must not land in the
+    repo's data directory. ``tmp_path_factory`` is per xdist worker, so
+    workers never share a cache either. The environment variable carries the
+    directory into spawned OCR worker processes.
+    """
+    directory = tmp_path_factory.mktemp("ocr_cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "OCR_CACHE_DIR", str(directory))
+        mp.setenv("OCR_CACHE_DIR", str(directory))
+        ocr_cache._memory.clear()
+        yield directory
+    ocr_cache._memory.clear()
 
 
 @pytest.fixture(scope="session")
 def db() -> Generator[Session, None, None]:
+    if _XDIST_WORKER:
+        _ensure_worker_database()
     # Ensure schema is up to date before any test touches the DB.
-    alembic_cfg = Config("alembic.ini")
-    command.upgrade(alembic_cfg, "head")
+    _upgrade_schema()
 
     with Session(engine) as session:
         init_db(session)
@@ -30,19 +160,143 @@ def db() -> Generator[Session, None, None]:
         session.commit()
 
 
-@pytest.fixture(scope="module")
+# Client and tokens are shared by the whole run: app startup and the password
+# hashing behind each login are the expensive parts, and a bearer token stays
+# valid for the session even when a test edits the user it belongs to.
+@pytest.fixture(scope="session")
 def client(db: Session) -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
+        # Build the OpenAPI schema and route dependencies up front so the first
+        # test doesn't absorb the cold-start cost in its timing.
+        c.get("/healthz")
+        c.get(f"{settings.API_V1_STR}/openapi.json")
         yield c
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def superuser_token_headers(client: TestClient) -> dict[str, str]:
     return get_superuser_token_headers(client)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]:
     return authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db=db
     )
+
+
+# Clients with the Authorization header preset, so tests don't pass
+# headers= on every call.
+@pytest.fixture(scope="session")
+def superuser_client(
+    superuser_token_headers: dict[str, str],
+) -> Generator[TestClient, None, None]:
+    with TestClient(app, headers=superuser_token_headers) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def normal_client(
+    normal_user_token_headers: dict[str, str],
+) -> Generator[TestClient, None, None]:
+    with TestClient(app, headers=normal_user_token_headers) as c:
+        yield c
+
+
+@pytest.fixture
+def created_application(
+    request: pytest.FixtureRequest, normal_client: TestClient
+) -> dict[str, Any]:
+    """Create an application owned by the normal test user and return its JSON.
+
+    Payload fields can be overridden through indirect parametrization::
+
+        @pytest.mark.parametrize(
+            "created_application", [{"applicant_nationality": "Thai"}], indirect=True
+        )
+    """
+    payload = {**_APPLICATION_PAYLOAD, **getattr(request, "param", {})}
+    response = normal_client.post(
+        f"{settings.API_V1_STR}/applications/",
+        json=payload,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture(scope="module")
+def processed_application(normal_client: TestClient) -> str:
+    """Create an application, upload a passport and run processing once per module.
+
+    Returns the application id. Tests using it must only read from it.
+    """
+    create_response = normal_client.post(
+        f"{settings.API_V1_STR}/applications/",
+        json=_APPLICATION_PAYLOAD,
+    )
+    assert create_response.status_code == 200
+    application_id = create_response.json()["id"]
+
+    upload_response = normal_client.post(
+        f"{settings.API_V1_STR}/applications/{application_id}/documents",
+        data=_PASSPORT_DATA,
+        files=_PASSPORT_FILES,
+    )
+    assert upload_response.status_code == 200
+    upload_content = upload_response.json()
+    assert upload_content["status"] == "uploaded"
+    assert upload_content["document_type"] == "passport"
+
+    process_response = normal_client.post(
+        f"{settings.API_V1_STR}/applications/{application_id}/process",
+        json={"force_reprocess": False},
+    )
+    assert process_response.status_code == 200
+    return application_id
+
+
+@pytest.fixture(scope="module")
+def seeded_application(
+    db: Session,
+    normal_user_token_headers: dict[str, str],  # noqa: ARG001 - creates the owner
+) -> str:
+    """Insert a review-ready application with one processed passport.
+
+    For tests that only read processed state. Returns the application id.
+    """
+    owner = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert owner is not None
+    application = CitizenshipApplication(
+        **_APPLICATION_PAYLOAD,
+        status=ApplicationStatus.REVIEW_READY.value,
+        owner_id=owner.id,
+    )
+    db.add_all(
+        [
+            application,
+            ApplicationDocument(
+                application_id=application.id,
+                document_type="passport",
+                original_filename="passport.pdf",
+                mime_type="application/pdf",
+                file_size_bytes=len(_PASSPORT_BYTES),
+                storage_path="seeded/passport.pdf",
+                status=DocumentStatus.PROCESSED.value,
+            ),
+        ]
+    )
+    db.commit()
+    return str(application.id)
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    # Slow pipeline tests only run with RUN_SLOW=1 (as in CI) or when selected
+    # explicitly with -m.
+    if os.environ.get("RUN_SLOW") == "1" or config.getoption("markexpr"):
+        return
+    slow = [item for item in items if item.get_closest_marker("slow")]
+    if slow:
+        config.hook.pytest_deselected(items=slow)
+        items[:] = [item for item in items if not item.get_closest_marker("slow")]
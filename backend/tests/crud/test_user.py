@@ -1,10 +1,20 @@
+from pathlib import Path
+
 from fastapi.encoders import jsonable_encoder
 from pwdlib.hashers.bcrypt import BcryptHasher
 from sqlmodel import Session
 
 from app import crud
 from app.core.security import verify_password
-from app.models import User, UserCreate, UserUpdate
+from app.models import (
+    ApplicationDocument,
+    CitizenshipApplication,
+    User,
+    UserCreate,
+    UserUpdate,
+)
+from app.services import ocr_cache
+from app.services.ocr import ExtractionResult
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -128,3 +138,37 @@ def test_authenticate_user_with_bcrypt_upgrades_to_argon2(db: Session) -> None:
     assert verified
     # Should not need another update since it's already argon2
     assert updated_hash is None
+
+
+def test_delete_user_evicts_cached_ocr_for_their_documents(
+    db: Session, tmp_path: Path
+) -> None:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = crud.create_user(session=db, user_create=user_in)
+    user_id = user.id
+    application = CitizenshipApplication(
+        applicant_full_name="Test Applicant",
+        applicant_nationality="Filipino",
+        owner_id=user_id,
+    )
+    db.add(application)
+    db.flush()
+    storage_path = tmp_path / "passport.pdf"
+    db.add(
+        ApplicationDocument(
+            application_id=application.id,
+            document_type="passport",
+            original_filename="passport.pdf",
+            mime_type="application/pdf",
+            file_size_bytes=0,
+            storage_path=str(storage_path),
+        )
+    )
+    db.commit()
+    result = ExtractionResult(text="Passport AB1234567")
+    ocr_cache.put("deleted-user-passport", result, source=storage_path)
+
+    crud.delete_user(session=db, db_user=user)
+
+    assert db.get(User, user_id) is None
+    assert ocr_cache.get("deleted-user-passport") is None
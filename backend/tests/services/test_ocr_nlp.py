@@ -1,105 +1,468 @@
 """Unit tests for OCR and NLP extraction services."""
 
+import asyncio
+import re
+import shutil
+import sys
 import tempfile
+import threading
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
+import fitz
+import pytest
+
+from app.core.config import settings
+from app.services import nlp, ocr
 from app.services.nlp import (
     ExtractedEntities,
     compute_document_nlp_score,
     extract_entities,
+    extract_entities_batch,
 )
 from app.services.ocr import ExtractionResult, extract_text, extract_text_from_pdf
 
-
-def _create_temp_pdf_with_text(text: str) -> Path:
-    """Create a minimal PDF with text content using PyMuPDF."""
-    import fitz
-
-    path = Path(tempfile.mktemp(suffix=".pdf"))
-    doc = fitz.open()
-    page = doc.new_page()
-    page.insert_text((72, 72), text, fontsize=12)
-    doc.save(str(path))
-    doc.close()
-    return path
+# RAM-backed on Linux; PDFs written here never touch the disk.
+_SHM = Path("/dev/shm")
+
+
+@pytest.fixture(scope="session")
+def text_pdf(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Iterator[Callable[[str], Path]]:
+    """Return a factory for one-page PDFs containing ``text``.
+
+    Each distinct text is rendered once per session; tests must not modify the
+    returned file.
+    """
+    if _SHM.is_dir():
+        directory = Path(tempfile.mkdtemp(prefix="text-pdf-", dir=_SHM))
+    else:
+        directory = tmp_path_factory.mktemp("pdfs")
+    cache: dict[str, Path] = {}
+
+    def build(text: str) -> Path:
+        path = cache.get(text)
+        if path is None:
+            path = directory / f"{len(cache)}.pdf"
+            doc = fitz.open()
+            page = doc.new_page()
+            page.insert_text((72, 72), text, fontsize=12)
+            doc.save(str(path))
+            doc.close()
+            cache[text] = path
+        return path
+
+    yield build
+    if directory.is_relative_to(_SHM):
+        shutil.rmtree(directory, ignore_errors=True)
 
 
 class TestOCRExtraction:
-    def test_pdf_text_extraction(self) -> None:
+    def test_pdf_text_extraction(self, text_pdf: Callable[[str], Path]) -> None:
         text = "Name: John Doe\nPassport: AB1234567\nDate: 15.03.1990"
-        pdf_path = _create_temp_pdf_with_text(text)
-        try:
-            result = extract_text_from_pdf(pdf_path)
-            assert isinstance(result, ExtractionResult)
-            assert result.extraction_method == "pymupdf_text_layer"
-            assert result.char_count > 0
-            assert not result.is_empty
-            assert "John Doe" in result.text
-            assert "AB1234567" in result.text
-        finally:
-            pdf_path.unlink(missing_ok=True)
+        pdf_path = text_pdf(text)
+        result = extract_text_from_pdf(pdf_path)
+        assert isinstance(result, ExtractionResult)
+        assert result.extraction_method == "pymupdf_text_layer"
+        assert result.char_count > 0
+        assert not result.is_empty
+        assert "John Doe" in result.text
+        assert "AB1234567" in result.text
 
     def test_missing_file_returns_error(self) -> None:
         result = extract_text_from_pdf("/nonexistent/file.pdf")
         assert result.extraction_method == "error"
         assert result.is_empty
 
-    def test_extract_text_routing_pdf(self) -> None:
+    def test_extract_text_routing_pdf(self, text_pdf: Callable[[str], Path]) -> None:
         text = "Test document content"
-        pdf_path = _create_temp_pdf_with_text(text)
-        try:
-            result = extract_text(pdf_path, "application/pdf")
-            assert result.extraction_method == "pymupdf_text_layer"
-            assert "Test document" in result.text
-        finally:
-            pdf_path.unlink(missing_ok=True)
+        pdf_path = text_pdf(text)
+        result = extract_text(pdf_path, "application/pdf")
+        assert result.extraction_method == "pymupdf_text_layer"
+        assert "Test document" in result.text
+
+    def test_extract_text_async_runs_in_worker_process(
+        self, text_pdf: Callable[[str], Path]
+    ) -> None:
+        pdf_path = text_pdf("Passport: AB1234567")
+        result = asyncio.run(ocr.extract_text_async(pdf_path, "application/pdf"))
+        assert result.extraction_method == "pymupdf_text_layer"
+        assert "AB1234567" in result.text
+
+    def test_ocr_language_follows_document_type(self) -> None:
+        assert ocr.ocr_lang_for_document_type(" Passport ") == "eng"
+        assert ocr.ocr_lang_for_document_type("language_certificate") == "nor"
+        assert ocr.ocr_lang_for_document_type("tax_statement") == ocr.DEFAULT_OCR_LANG
+        assert ocr.ocr_lang_for_document_type(None) == ocr.DEFAULT_OCR_LANG
 
     def test_extract_text_unsupported_mime(self) -> None:
         result = extract_text("/some/file.txt", "text/plain")
         assert result.extraction_method == "unsupported"
 
 
-class TestNLPExtraction:
-    def test_date_extraction(self) -> None:
-        text = "Born on 15.03.1990. Passport issued 2020-01-15."
-        entities = extract_entities(text)
-        assert len(entities.dates) >= 2
+    def test_text_layer_expands_ligatures(self, tmp_path: Path) -> None:
+        fonts = sorted(Path("/usr/share/fonts").rglob("DejaVu*.ttf"))
+        if not fonts:
+            pytest.skip("No DejaVu font with ligature glyphs available")
+        pdf_path = tmp_path / "ligature.pdf"
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_font(fontname="dejavu", fontfile=str(fonts[0]))
+        page.insert_text((72, 72), "Language certi\ufb01cate", fontname="dejavu")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        assert extract_text_from_pdf(pdf_path).text == "Language certificate"
+
+    def test_blank_leading_pages_go_straight_to_ocr(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        pdf_path = tmp_path / "scanned.pdf"
+        doc = fitz.open()
+        for _ in range(2):
+            doc.new_page()
+        doc.save(str(pdf_path))
+        doc.close()
+
+        sentinel = ExtractionResult(text="ocr", extraction_method="tesseract_ocr_pdf")
+        monkeypatch.setattr(ocr, "_ocr_pdf_pages", lambda _path, **_kw: sentinel)
+        assert extract_text_from_pdf(pdf_path) is sentinel
+
+    def test_text_after_blank_leading_pages_is_read_from_text_layer(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        pdf_path = tmp_path / "cover-sheets.pdf"
+        doc = fitz.open()
+        for _ in range(2):
+            doc.new_page()
+        doc.new_page().insert_text((72, 72), "Passport: AB1234567", fontsize=12)
+        doc.save(str(pdf_path))
+        doc.close()
+
+        def fail(*_args: object, **_kwargs: object) -> ExtractionResult:
+            raise AssertionError("a PDF with a text layer should not be OCRed")
+
+        monkeypatch.setattr(ocr, "_ocr_pdf_pages", fail)
+        result = extract_text_from_pdf(pdf_path)
+        assert result.extraction_method == "pymupdf_text_layer"
+        assert result.text == "Passport: AB1234567"
+
+    def test_discarding_a_stale_pool_keeps_the_current_one(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        class FakePool:
+            terminated = False
+
+            def terminate(self) -> None:
+                self.terminated = True
+
+        stale, current = FakePool(), FakePool()
+        monkeypatch.setattr(ocr, "_POOL", current)
+        ocr._discard_pool(stale)  # type: ignore[arg-type]
+        assert ocr._POOL is current and not current.terminated
+
+        ocr._discard_pool(current)  # type: ignore[arg-type]
+        assert ocr._POOL is None and current.terminated
+
+    def test_ocr_cache_serves_hits_from_memory_before_disk(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        from app.services import ocr_cache
+
+        monkeypatch.setattr(settings, "OCR_CACHE_DIR", str(tmp_path))
+        result = ExtractionResult(text="hot", extraction_method="tesseract_ocr")
+        ocr_cache.put("memory-tier-key", result)
+        ocr_cache._disk_cache().clear()
+        assert ocr_cache.get("memory-tier-key") == result
+
+    def test_ocr_cache_hits_do_not_share_warnings(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        from app.services import ocr_cache
+
+        monkeypatch.setattr(settings, "OCR_CACHE_DIR", str(tmp_path))
+        ocr_cache.put(
+            "warnings-key",
+            ExtractionResult(text="hot", extraction_method="tesseract_ocr"),
+        )
+        first = ocr_cache.get("warnings-key")
+        assert first is not None
+        first.warnings.append("caller note")
+        assert ocr_cache.get("warnings-key") == ExtractionResult(
+            text="hot", extraction_method="tesseract_ocr"
+        )
 
-    def test_passport_number_extraction(self) -> None:
-        text = "Passport number: AB1234567"
-        entities = extract_entities(text)
-        assert "AB1234567" in entities.passport_numbers
+    def test_ocr_cache_evict_source_drops_memory_and_disk_entries(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        from app.services import ocr_cache
+
+        monkeypatch.setattr(settings, "OCR_CACHE_DIR", str(tmp_path))
+        source = tmp_path / "passport.pdf"
+        result = ExtractionResult(text="Passport AB1234567", extraction_method="pymupdf_text_layer")
+        ocr_cache.put("evicted-key", result, source=source)
+        ocr_cache.put("kept-key", result, source=tmp_path / "other.pdf")
+
+        ocr_cache.evict_source(source)
+
+        assert ocr_cache.get("evicted-key") is None
+        assert "evicted-key" not in ocr_cache._disk_cache()
+        assert ocr_cache.get("kept-key") is not None
+
+    def test_ocr_cache_key_depends_on_pdf_text_backend(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        from app.services import ocr_cache
+
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 same bytes")
+        pymupdf_key = ocr_cache.cache_key(pdf_path, "application/pdf", "eng")
+        monkeypatch.setattr(settings, "PDF_TEXT_BACKEND", "pypdfium2")
+        assert ocr_cache.cache_key(pdf_path, "application/pdf", "eng") != pymupdf_key
+
+    def test_pypdfium2_backend_matches_pymupdf_text(
+        self, monkeypatch: pytest.MonkeyPatch, text_pdf: Callable[[str], Path]
+    ) -> None:
+        pytest.importorskip("pypdfium2")
+        pdf_path = text_pdf("Name: John Doe\nPassport: AB1234567")
+        baseline = extract_text_from_pdf(pdf_path)
+        monkeypatch.setattr(settings, "PDF_TEXT_BACKEND", "pypdfium2")
+        result = extract_text_from_pdf(pdf_path)
+        assert result.extraction_method == "pdfium_text_layer"
+        assert result.text.split() == baseline.text.split()
+
+    def test_pypdfium2_backend_falls_back_to_pymupdf(
+        self, monkeypatch: pytest.MonkeyPatch, text_pdf: Callable[[str], Path]
+    ) -> None:
+        def broken(_path: Path) -> list[str]:
+            raise ImportError("pypdfium2")
+
+        monkeypatch.setattr(settings, "PDF_TEXT_BACKEND", "pypdfium2")
+        monkeypatch.setattr(ocr, "_extract_with_pypdfium2", broken)
+        result = extract_text_from_pdf(text_pdf("Passport: AB1234567"))
+        assert result.extraction_method == "pymupdf_text_layer"
+        assert "AB1234567" in result.text
+
+    def test_extract_text_reuses_cached_result(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        text_pdf: Callable[[str], Path],
+    ) -> None:
+        monkeypatch.setattr(settings, "OCR_CACHE_DIR", str(tmp_path))
+        pdf_path = text_pdf("Cached passport text")
+        first = extract_text(pdf_path, "application/pdf")
+        calls: list[Path] = []
+        monkeypatch.setattr(
+            ocr, "extract_text_from_pdf", lambda p, **_kw: calls.append(p) or first
+        )
+        assert extract_text(pdf_path, "application/pdf") == first
+        assert calls == []
+        extract_text(pdf_path, "application/pdf", use_cache=False)
+        assert calls == [pdf_path]
+
+    def test_low_confidence_pages_are_retried_at_higher_dpi(
+        self, monkeypatch: pytest.MonkeyPatch, text_pdf: Callable[[str], Path]
+    ) -> None:
+        calls: list[tuple[list[int], int]] = []
+
+        def fake_sharded(
+            _path: Path, pages: list[int], dpi: int, _lang: str
+        ) -> list[tuple[int, ExtractionResult]]:
+            calls.append((pages, dpi))
+            text = "x" * (dpi // 2)
+            return [
+                (
+                    n,
+                    ExtractionResult(
+                        text=text, extraction_method="tesseract_ocr", confidence=dpi / 1000
+                    ),
+                )
+                for n in pages
+            ]
+
+        monkeypatch.setattr(ocr, "_ocr_pages_sharded", fake_sharded)
+        monkeypatch.setattr(settings, "OCR_RETRY_DPI", 300)
+        result = ocr._ocr_pdf_pages(text_pdf("scan"), dpi=200)
+        assert calls == [([0], 200), ([0], 300)]
+        assert result.char_count == 150
+
+    def test_low_confidence_retry_is_off_by_default(
+        self, monkeypatch: pytest.MonkeyPatch, text_pdf: Callable[[str], Path]
+    ) -> None:
+        calls: list[int] = []
+
+        def fake_sharded(
+            _path: Path, pages: list[int], dpi: int, _lang: str
+        ) -> list[tuple[int, ExtractionResult]]:
+            calls.append(dpi)
+            sparse = ExtractionResult(text="x", extraction_method="tesseract_ocr")
+            return [(n, sparse) for n in pages]
+
+        monkeypatch.setattr(ocr, "_ocr_pages_sharded", fake_sharded)
+        ocr._ocr_pdf_pages(text_pdf("scan"), dpi=200)
+        assert calls == [200]
+
+
+    def test_preprocess_hands_tesseract_grayscale(self) -> None:
+        from PIL import Image
+
+        gray = ocr._preprocess_for_ocr(Image.new("RGB", (20, 20), (210, 205, 190)))
+        assert gray.mode == "L"
+
+    def test_postprocess_fixes_digit_misreads_only(self) -> None:
+        raw = "Passport NO1234567\x07 born 1O.O3.199O, issued 20l5\nStorgata 12 0150 Oslo"
+        assert ocr._postprocess_ocr_text(raw) == (
+            "Passport NO1234567 born 10.03.1990, issued 2015\nStorgata 12 0150 Oslo"
+        )
 
-    def test_nationality_extraction(self) -> None:
-        text = "The applicant is of Pakistani nationality."
-        entities = extract_entities(text)
-        assert any("pakistani" in n.lower() for n in entities.nationalities)
+    def test_batch_ocr_splits_pages_on_form_feed(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        pytesseract = pytest.importorskip("pytesseract")
+        paths = [str(tmp_path / "p0.pnm"), str(tmp_path / "p1.pnm")]
 
-    def test_citizenship_keywords(self) -> None:
-        text = "Application for citizenship and permanent residence in Norway."
-        entities = extract_entities(text)
-        assert "citizenship" in entities.keywords_found
-        assert "permanent residence" in entities.keywords_found
+        monkeypatch.setattr(
+            pytesseract, "image_to_string", lambda *_a, **_k: "first page\x0c\x0c"
+        )
+        results = ocr._ocr_image_batch(paths)
+        assert results is not None
+        assert [r.text for r in results] == ["first page", ""]
+        assert (tmp_path / "images.txt").read_text().split() == paths
 
-    def test_language_indicators(self) -> None:
-        text = "Norskprøve B1 bestått. Samfunnskunnskap passed."
-        entities = extract_entities(text)
-        assert len(entities.language_indicators) >= 2
+        monkeypatch.setattr(
+            pytesseract, "image_to_string", lambda *_a, **_k: "a\x0cb\x0cc\x0c"
+        )
+        assert ocr._ocr_image_batch(paths) is None
+
+    def test_in_process_tesserocr_is_preferred_when_installed(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from PIL import Image
+
+        created: list[dict[str, object]] = []
+
+        class FakeAPI:
+            def __init__(self, **kwargs: object) -> None:
+                created.append(kwargs)
+                self.variables: dict[str, str] = {}
+
+            def SetVariable(self, name: str, value: str) -> None:
+                self.variables[name] = value
+
+            def SetImage(self, _image: object) -> None:
+                pass
+
+            def GetUTF8Text(self) -> str:
+                return "Passport AB1234567"
+
+        fake = type(sys)("tesserocr")
+        fake.PyTessBaseAPI = FakeAPI  # type: ignore[attr-defined]
+        monkeypatch.setitem(sys.modules, "tesserocr", fake)
+        monkeypatch.setattr(ocr, "_tesserocr_local", threading.local())
+        monkeypatch.setattr(settings, "TESSERACT_CONFIG", "--oem 1 -c thresholding_method=1")
+        monkeypatch.setattr(settings, "TESSERACT_PSM", 6)
+
+        image = Image.new("L", (8, 8), 255)
+        assert ocr._ocr_image(image, lang="eng").text == "Passport AB1234567"
+        ocr._ocr_image(image, lang="eng")
+        assert created == [{"lang": "eng", "oem": 1, "psm": 6}]
+        assert ocr._tesserocr_api("eng").variables == {"thresholding_method": "1"}
+
+        # Options tesserocr cannot express keep the CLI path.
+        assert ocr._tesserocr_options("--oem 1 --dpi 300") is None
+
+    def test_image_list_is_ocred_in_one_batch(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        from PIL import Image
+
+        paths = []
+        for name in ("a.png", "b.png"):
+            Image.new("RGB", (8, 8), "white").save(tmp_path / name)
+            paths.append(tmp_path / name)
+        paths.insert(1, tmp_path / "missing.png")
+
+        batches: list[list[str]] = []
+
+        def fake_batch(image_paths: list[str], **_kw: object) -> list[ExtractionResult]:
+            batches.append(image_paths)
+            return [ExtractionResult(text=f"page {i}") for i in range(len(image_paths))]
+
+        monkeypatch.setattr(ocr, "_ocr_image_batch", fake_batch)
+        results = ocr.extract_text_from_images(paths)
+        assert len(batches) == 1 and len(batches[0]) == 2
+        assert [r.text for r in results] == ["page 0", "", "page 1"]
+        assert results[1].extraction_method == "error"
+
+        sentinel = ExtractionResult(text="single", extraction_method="tesseract_ocr")
+        monkeypatch.setattr(ocr, "_ocr_image_batch", lambda *_a, **_kw: None)
+        monkeypatch.setattr(ocr, "_ocr_image", lambda *_a, **_kw: sentinel)
+        assert ocr.extract_text_from_images(paths) == [sentinel, results[1], sentinel]
+
+
+# One text per feature covered by test_corpus_feature_is_extracted; each line
+# is independent, so a single extraction serves every assertion.
+_NLP_CORPUS = (
+    "Born on 15.03.1990. Passport issued 2020-01-15.\n"
+    "Passport number: AB1234567\n"
+    "The applicant is of Pakistani nationality.\n"
+    "Application for citizenship and permanent residence in Norway.\n"
+    "Norskprøve B1 bestått. Samfunnskunnskap passed.\n"
+    "7 years of residence in Norway. Folkeregistrert address confirmed.\n"
+    "Full name: Ahmed Hassan\nSurname: Hassan\n"
+    "Født 15 mars 2000. Innvilget 3 januar 2020.\n"
+)
 
-    def test_residency_indicators(self) -> None:
-        text = "7 years of residence in Norway. Folkeregistrert address confirmed."
-        entities = extract_entities(text)
-        assert len(entities.residency_indicators) >= 1
+# Case, non-ASCII letters and digits, and missing separators are where
+# Hyperscan's \d, \b and case folding could drift from re/re2.
+_PREFILTER_PARITY_TEXTS = (
+    _NLP_CORPUS,
+    _NLP_CORPUS.upper(),
+    _NLP_CORPUS.lower(),
+    "PASSPORT NUMBER: AB1234567\nGYLDIG TIL: 2031-06-30",
+    "Fødselsdato:15.03.1990Utløpsdato:15.03.2030",
+    "Dato: ١٥.٠٣.١٩٩٠, İstanbul. Expiry date: 01.02.2030",
+    "Full name: Åse Østby\nSurname: ØSTBY\n12 MÅNEDER, 7 ÅR i Norge",
+    "Storgata 12, 0150 OSLO. Valid until 1 JAN 2030",
+)
 
-    def test_name_extraction(self) -> None:
-        text = "Full name: Ahmed Hassan\nSurname: Hassan"
-        entities = extract_entities(text)
-        assert any("Ahmed Hassan" in n for n in entities.names)
 
-    def test_norwegian_dates(self) -> None:
-        text = "Født 15 mars 2000. Innvilget 3 januar 2020."
+@pytest.fixture(scope="module")
+def corpus_entities() -> ExtractedEntities:
+    return extract_entities(_NLP_CORPUS)
+
+
+class TestNLPExtraction:
+    @pytest.mark.parametrize(
+        ("attribute", "expected"),
+        [
+            ("dates", "15.03.1990"),
+            ("dates", "2020-01-15"),
+            ("passport_numbers", "AB1234567"),
+            ("nationalities", "pakistani"),
+            ("keywords_found", "citizenship"),
+            ("keywords_found", "permanent residence"),
+            ("language_indicators", "norskprøve"),
+            ("language_indicators", "samfunnskunnskap"),
+            ("residency_indicators", "years of residence"),
+            ("residency_indicators", "folkeregistrert"),
+            ("names", "Ahmed Hassan"),
+            # Norwegian month names
+            ("dates", "15 mars 2000"),
+            ("dates", "3 januar 2020"),
+        ],
+    )
+    def test_corpus_feature_is_extracted(
+        self, corpus_entities: ExtractedEntities, attribute: str, expected: str
+    ) -> None:
+        assert expected in getattr(corpus_entities, attribute)
+
+    def test_residency_regex_keeps_first_match(self) -> None:
+        text = "Lived 7 years in Bergen and 3 år in Oslo."
         entities = extract_entities(text)
-        assert len(entities.dates) >= 2
+        assert entities.residency_indicators == ["7 years"]
 
     def test_empty_text(self) -> None:
         entities = extract_entities("")
@@ -118,6 +481,86 @@ class TestNLPExtraction:
         entities = extract_entities(text)
         assert entities.raw_entity_count >= 5
 
+    def test_oversized_text_is_capped(self, caplog: pytest.LogCaptureFixture) -> None:
+        from app.services.nlp import MAX_SCAN_CHARS
+
+        text = "x" * MAX_SCAN_CHARS + " Passport number: AB1234567"
+        with caplog.at_level("WARNING", logger="app.services.nlp"):
+            assert extract_entities(text).passport_numbers == []
+        assert "NLP scan truncated" in caplog.text
+        assert "AB1234567" in extract_entities(text, full_scan=True).passport_numbers
+
+    def test_literal_scan_matches_without_automaton(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        text = (
+            "Søknad om statsborgerskap. Nationality: Somali.\n"
+            "Norskprøve B1 bestått, samfunnskunnskap passed.\n"
+            "Permanent opphold, folkeregistrert i Oslo."
+        )
+        with_automaton = extract_entities(text)
+        monkeypatch.setattr(nlp, "_LITERAL_AUTOMATON", None)
+        nlp._extract_entities_cached.cache_clear()
+        without_automaton = extract_entities(text)
+        for name in (
+            "nationalities",
+            "keywords_found",
+            "language_indicators",
+            "residency_indicators",
+        ):
+            assert sorted(getattr(with_automaton, name)) == sorted(
+                getattr(without_automaton, name)
+            )
+
+    def test_prefilter_skips_only_non_matching_regexes(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        text = (
+            "Name: Ola Nordmann\nPassport number: AB1234567\n"
+            "Date of expiry: 04.07.2029\nStorgata 12, 0001 Oslo. 7 years in Norway."
+        )
+        unfiltered = extract_entities(text)
+        monkeypatch.setattr(
+            nlp,
+            "_prefilter_candidates",
+            lambda t: {r for r in nlp._PREFILTER_TARGETS if r.search(t)},
+        )
+        nlp._extract_entities_cached.cache_clear()
+        assert extract_entities(text).to_dict() == unfiltered.to_dict()
+
+    @pytest.mark.parametrize("text", _PREFILTER_PARITY_TEXTS)
+    def test_hyperscan_prefilter_matches_unfiltered_output(
+        self, monkeypatch: pytest.MonkeyPatch, text: str
+    ) -> None:
+        if nlp._PREFILTER_DB is None:
+            pytest.skip("hyperscan is not installed")
+        assert nlp._prefilter_candidates(text) is not None
+        nlp._extract_entities_cached.cache_clear()
+        filtered = extract_entities(text)
+        monkeypatch.setattr(nlp, "_prefilter_candidates", lambda _text: None)
+        nlp._extract_entities_cached.cache_clear()
+        assert filtered.to_dict() == extract_entities(text).to_dict()
+
+    def test_cached_extraction_returns_independent_copies(self) -> None:
+        text = "Passport number: AB1234567"
+        first = extract_entities(text)
+        first.passport_numbers.append("tampered")
+        assert extract_entities(text).passport_numbers == ["AB1234567"]
+
+    def test_batch_matches_single_extraction(self) -> None:
+        texts = [
+            "Passport number: AB1234567",
+            "",
+            "Norskprøve B1 bestått. 7 years in Norway.",
+        ]
+        batch = extract_entities_batch(texts)
+        assert len(batch) == len(texts)
+        for text, entities in zip(texts, batch, strict=True):
+            assert entities.to_dict() == extract_entities(text).to_dict()
+
+    def test_batch_empty_input(self) -> None:
+        assert extract_entities_batch([]) == []
+
     def test_nlp_score_computation(self) -> None:
         entities = ExtractedEntities(
             dates=["01.01.1990", "15.03.2020"],
@@ -136,10 +579,36 @@ class TestNLPExtraction:
         assert score == 0.0
 
 
+_MODULE_PATTERNS = [
+    *nlp._DATE_PATTERNS,
+    *nlp._PASSPORT_PATTERNS,
+    nlp._EXPIRY_CONTEXT_PATTERN,
+    *nlp._RESIDENCY_PATTERNS,
+    *nlp._NAME_PATTERNS,
+    nlp._NUMERIC_PATTERN,
+    nlp._MRZ_TD3_LINE2.pattern,
+]
+
+
+class TestRegexEngine:
+    """Every module-level pattern must stay within the re2-compatible subset."""
+
+    @pytest.mark.parametrize("pattern", _MODULE_PATTERNS)
+    def test_pattern_compiles_with_re(self, pattern: str) -> None:
+        re.compile(pattern)
+
+    @pytest.mark.parametrize("pattern", _MODULE_PATTERNS)
+    def test_pattern_compiles_with_re2(self, pattern: str) -> None:
+        re2 = pytest.importorskip("re2")
+        re2.compile(pattern)
+
+
 class TestEndToEndOCRNLP:
     """Integration: PDF -> OCR -> NLP pipeline."""
 
-    def test_pdf_to_entities(self) -> None:
+    def test_pdf_to_entities(
+        self, text_pdf: Callable[[str], Path]
+    ) -> None:
         text = (
             "KINGDOM OF NORWAY\n"
             "PASSPORT\n"
@@ -151,24 +620,23 @@ class TestEndToEndOCRNLP:
             "Date of issue: 2023-05-10\n"
             "Valid until: 2033-05-10\n"
         )
-        pdf_path = _create_temp_pdf_with_text(text)
-        try:
-            ocr_result = extract_text_from_pdf(pdf_path)
-            assert not ocr_result.is_empty
-
-            entities = extract_entities(ocr_result.text)
-            assert len(entities.dates) >= 2
-            assert len(entities.passport_numbers) >= 1
-            assert any("norwegian" in n.lower() for n in entities.nationalities)
-            assert any("NGUYEN" in n or "Thi Lan" in n for n in entities.names)
-            assert "passport" in entities.keywords_found
-
-            score = compute_document_nlp_score(entities)
-            assert score > 0.3
-        finally:
-            pdf_path.unlink(missing_ok=True)
-
-    def test_pdf_expired_passport_expiry_date_extracted(self) -> None:
+        pdf_path = text_pdf(text)
+        ocr_result = extract_text_from_pdf(pdf_path)
+        assert not ocr_result.is_empty
+
+        entities = extract_entities(ocr_result.text)
+        assert len(entities.dates) >= 2
+        assert len(entities.passport_numbers) >= 1
+        assert any("norwegian" in n.lower() for n in entities.nationalities)
+        assert any("NGUYEN" in n or "Thi Lan" in n for n in entities.names)
+        assert "passport" in entities.keywords_found
+
+        score = compute_document_nlp_score(entities)
+        assert score > 0.3
+
+    def test_pdf_expired_passport_expiry_date_extracted(
+        self, text_pdf: Callable[[str], Path]
+    ) -> None:
         """End-to-end: expiry date labeled in a PDF must land in expiry_dates."""
         text = (
             "PASSPORT\n"
@@ -177,15 +645,12 @@ class TestEndToEndOCRNLP:
             "Date of issue: 10.05.2015\n"
             "Expiry date: 10.05.2025\n"
         )
-        pdf_path = _create_temp_pdf_with_text(text)
-        try:
-            ocr_result = extract_text_from_pdf(pdf_path)
-            entities = extract_entities(ocr_result.text)
-            assert "10.05.2025" in entities.expiry_dates
-            # Birth date must NOT be misclassified as expiry
-            assert "15.03.1985" not in entities.expiry_dates
-        finally:
-            pdf_path.unlink(missing_ok=True)
+        pdf_path = text_pdf(text)
+        ocr_result = extract_text_from_pdf(pdf_path)
+        entities = extract_entities(ocr_result.text)
+        assert "10.05.2025" in entities.expiry_dates
+        # Birth date must NOT be misclassified as expiry
+        assert "15.03.1985" not in entities.expiry_dates
 
 
 class TestExpiryDateExtraction:
@@ -199,6 +664,11 @@ class TestExpiryDateExtraction:
         entities = extract_entities("Valid until: 2030-06-15")
         assert "2030-06-15" in entities.expiry_dates
 
+    def test_year_first_expiry_not_also_read_day_first(self) -> None:
+        # "30-06-15" would parse as 30 June 2015 and flag the document expired.
+        entities = extract_entities("Expiry date: 2030-06-15")
+        assert entities.expiry_dates == ["2030-06-15"]
+
     def test_expires_on_extracted(self) -> None:
         entities = extract_entities("This permit expires 01/09/2027.")
         assert "01/09/2027" in entities.expiry_dates
@@ -231,6 +701,11 @@ class TestExpiryDateExtraction:
         entities = extract_entities("Valid until: 04 JUL / JUIL 2019")
         assert "04 JUL / JUIL 2019" in entities.expiry_dates
 
+    def test_expiry_date_keeps_casing_when_lowercasing_changes_length(self) -> None:
+        # "İ".lower() is two characters, so spans on the lowered text would drift.
+        entities = extract_entities("Born in İzmir. Expiry date: 04 JUL 2029")
+        assert entities.expiry_dates == ["04 JUL 2029"]
+
     def test_underscore_date_expiry_extracted(self) -> None:
         entities = extract_entities("Gyldig til: 2019_07_04")
         assert "2019_07_04" in entities.expiry_dates
@@ -351,6 +826,19 @@ class TestParseDateFlexible:
         assert result.month == 12
         assert result.day == 31
 
+    def test_two_digit_year_century_pivot(self) -> None:
+        from datetime import date
+
+        from app.services.nlp import parse_date_flexible
+
+        assert parse_date_flexible("01.01.68") == date(2068, 1, 1)
+        assert parse_date_flexible("01.01.69") == date(1969, 1, 1)
+
+    def test_impossible_calendar_date_returns_none(self) -> None:
+        from app.services.nlp import parse_date_flexible
+
+        assert parse_date_flexible("31.02.2025") is None
+
     def test_invalid_returns_none(self) -> None:
         from app.services.nlp import parse_date_flexible
 
@@ -1,14 +1,17 @@
 """Unit tests for the core security module (password hashing, JWT tokens)."""
 
+import time
 from datetime import timedelta
 
 import jwt
 import pytest
 
+from app.core import security
 from app.core.config import settings
 from app.core.security import (
     ALGORITHM,
     create_access_token,
+    decode_access_token,
     get_password_hash,
     verify_password,
 )
@@ -41,6 +44,15 @@ class TestPasswordHashing:
         is_valid, _ = verify_password("", hashed)
         assert is_valid is False
 
+    def test_verify_empty_password_skips_hasher(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(*_args: object) -> tuple[bool, str | None]:
+            raise AssertionError("hasher should not run for an empty password")
+
+        monkeypatch.setattr(security.password_hash, "verify_and_update", fail)
+        assert verify_password("", "$argon2id$unused") == (False, None)
+
     def test_verify_returns_updated_hash_when_needed(self) -> None:
         """verify_password returns (bool, updated_hash|None).
         If the hash scheme is current, updated_hash should be None."""
@@ -71,6 +83,14 @@ class TestAccessToken:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         assert "exp" in payload
 
+    def test_expiration_is_whole_seconds_from_now(self) -> None:
+        before = int(time.time())
+        token = create_access_token(subject="user-1", expires_delta=timedelta(minutes=30))
+        after = int(time.time())
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        assert isinstance(payload["exp"], int)
+        assert before + 1800 <= payload["exp"] <= after + 1800
+
     def test_token_invalid_signature_raises(self) -> None:
         token = create_access_token(subject="user-1", expires_delta=timedelta(hours=1))
         with pytest.raises(jwt.InvalidSignatureError):
@@ -89,3 +109,25 @@ class TestAccessToken:
         token = create_access_token(subject=uid, expires_delta=timedelta(hours=1))
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         assert payload["sub"] == str(uid)
+
+    def test_decode_access_token_reuses_verified_payload(self) -> None:
+        token = create_access_token(subject="user-cached", expires_delta=timedelta(hours=1))
+        payload = decode_access_token(token)
+        assert payload["sub"] == "user-cached"
+        assert decode_access_token(token) is payload
+
+    def test_decode_access_token_rejects_expired_cache_entry(self) -> None:
+        token = create_access_token(subject="user-1", expires_delta=timedelta(seconds=-1))
+        key = (settings.SECRET_KEY, token)
+        security._token_cache[key] = {"sub": "user-1", "exp": time.time() - 1}
+        with pytest.raises(jwt.ExpiredSignatureError):
+            decode_access_token(token)
+        assert key not in security._token_cache
+
+    def test_decode_access_token_does_not_cache_failures(self) -> None:
+        token = jwt.encode(
+            {"sub": "user-1", "exp": time.time() + 3600}, "wrong-secret-key", ALGORITHM
+        )
+        with pytest.raises(jwt.InvalidSignatureError):
+            decode_access_token(token)
+        assert (settings.SECRET_KEY, token) not in security._token_cache